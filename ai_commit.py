@@ -1,71 +1,161 @@
-import subprocess
 import sys
+import os
+import json
 import argparse
+import dataclasses
+import threading
 from commit_generator import CommitGenerator, load_config
 
-def run_git_command(command):
-    """Run a git command and return the result"""
-    try:
-        result = subprocess.run(
-            command,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
-        print(f"Git error: {e.stderr}", file=sys.stderr)
+def run_git_command(session, *args):
+    """Run a git command through the session and return the result"""
+    result = session.run(*args)
+    if result.returncode != 0:
+        print(f"Git error: {result.stderr}", file=sys.stderr)
+        return None
+    return result.stdout.strip()
+
+def commit_with_subprocess(generator, commit_message, push):
+    """Commit, and optionally push, from a child git process"""
+    commit_result = run_git_command(generator.git, "commit", "-m", commit_message)
+    if commit_result is not None:
+        print("✅ Commit successful!")
+
+        if push:
+            print("📤 Pushing to remote...")
+            push_result = run_git_command(generator.git, "push", "origin", "main")
+            if push_result is not None:
+                print("✅ Push successful!")
+            else:
+                print("❌ Push failed")
+    else:
+        print("❌ Commit failed")
+
+def stream_to_stdout(text):
+    """Print streamed message text as soon as it arrives"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+def run_batch(generator, spool_path, keep_spool=False):
+    """Submit the staged diff as a batch, or collect the message of an earlier submission"""
+    context = generator.get_repo_context()
+    if not os.path.exists(spool_path):
+        chunks = generator.split_diff(generator.get_staged_diff())
+        messages = generator.cached_messages(chunks, context)
+        if messages is not None:
+            return generator.merge_commit_messages(chunks, messages)
+
+        batch_id = generator.submit_batch(chunks, [context] * len(chunks))
+
+        with open(spool_path, "w") as spool:
+            for chunk in chunks:
+                spool.write(json.dumps({"batch_id": batch_id, "diff": chunk}) + "\n")
+
+        print(f"📦 Submitted batch {batch_id}. Run again with --batch {spool_path} to collect the message")
+        return None
+
+    with open(spool_path) as spool:
+        entries = [json.loads(line) for line in spool if line.strip()]
+    if not entries:
+        print(f"Error: Batch spool {spool_path} is empty. Delete it to submit a new batch", file=sys.stderr)
+        sys.exit(1)
+
+    # The message describes the spooled diff, so refuse to commit anything else
+    if "".join(entry["diff"] for entry in entries) != generator.get_staged_diff():
+        print(f"Error: Staged changes differ from the batch in {spool_path}. Delete it to submit a new batch", file=sys.stderr)
+        sys.exit(1)
+
+    batch_id = entries[0]["batch_id"]
+    messages = generator.poll_batch(batch_id, len(entries))
+    if messages is None:
+        print(f"⏳ Batch {batch_id} is still running. Try again later")
         return None
 
+    diffs = [entry["diff"] for entry in entries]
+    generator.cache_messages(diffs, context, messages)
+    if not keep_spool:
+        os.remove(spool_path)
+    return generator.merge_commit_messages(diffs, messages)
+
+def generate_message(generator, spool_path, dry_run=False):
+    """Generate and print the commit message, or return None if a batch is still pending"""
+    if spool_path:
+        # A dry run keeps the spool so the real run can collect the same batch
+        commit_message = run_batch(generator, spool_path, keep_spool=dry_run)
+        if commit_message is not None:
+            print(f"🤖 Generated message: {commit_message}")
+        return commit_message
+
+    diff_content = generator.get_staged_diff()
+    context = generator.get_repo_context()
+
+    chunks = generator.split_diff(diff_content)
+    if len(chunks) > 1:
+        messages = generator.generate_commit_messages(chunks, context)
+        commit_message = generator.merge_commit_messages(chunks, messages)
+        print(f"🤖 Generated message: {commit_message}")
+    else:
+        print("🤖 Generated message: ", end="", flush=True)
+        commit_message = generator.generate_commit_message(diff_content, context, on_delta=stream_to_stdout)
+        print()
+    return commit_message
+
 def main():
     parser = argparse.ArgumentParser(description="AI-powered git commit")
     parser.add_argument("--push", action="store_true", help="Push after committing")
     parser.add_argument("--dry-run", action="store_true", help="Show message without committing")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the generated message cache")
+    parser.add_argument("--batch", metavar="SPOOL", help="Generate via the OpenAI Batch API, tracking the job in a JSONL spool file")
     args = parser.parse_args()
 
-    if run_git_command(["git", "rev-parse", "--git-dir"]) is None:
+    generator = CommitGenerator()
+
+    if generator._probe_repo()["root"] is None:
         print("Error: Not in a git repository", file=sys.stderr)
         sys.exit(1)
 
-    staged_files = run_git_command(["git", "diff", "--cached", "--name-only"])
+    staged_files = generator.get_staged_files()
     if not staged_files:
         print("No staged changes found. Use 'git add' to stage changes first")
         sys.exit(1)
 
-    print(f"📝 Staged files: {staged_files.replace(chr(10), ', ')}")
+    print(f"📝 Staged files: {', '.join(staged_files)}")
 
     try:
-        config = load_config()
-        generator = CommitGenerator(config)
-
-        diff_content = generator.get_staged_diff()
-        context = generator.get_repo_context()
-        commit_message = generator.generate_commit_message(diff_content, context)
-
-        print(f"🤖 Generated message: {commit_message}")
+        commit_message = generator.get_trivial_message()
+        if commit_message:
+            print(f"🤖 Generated message: {commit_message}")
+        else:
+            generator.config = dataclasses.replace(load_config(), use_cache=not args.no_cache)
+            commit_message = generate_message(generator, args.batch, args.dry_run)
+            if commit_message is None:
+                return
 
         if args.dry_run:
             print("Dry run completed. No commit made")
             return
 
+        # Refresh the index while the user reads the message so the commit itself starts warm
+        refresh = threading.Thread(target=generator.git.run, args=("update-index", "-q", "--refresh"), daemon=True)
+        refresh.start()
+
         response = str(input("Commit with this message? [Y/n]: ").strip().lower())
         if response and response not in ["y", "yes"]:
             print("Commit cancelled")
             return
 
-        commit_result = run_git_command(["git", "commit", "-m", commit_message])
-        if commit_result is not None:
-            print("✅ Commit successful!")
-
-            if args.push:
-                print("📤 Pushing to remote...")
-                push_result = run_git_command(["git", "push", "origin", "main"])
-                if push_result is not None:
-                    print("✅ Push successful!")
-                else:
-                    print("❌ Push failed")
-        else:
-            print("❌ Commit failed")
+        # git commit needs index.lock, which the refresh holds until it finishes
+        refresh.join()
+
+        if os.name == "nt":
+            # exec on Windows spawns a new process and exits instead of replacing this one
+            commit_with_subprocess(generator, commit_message, args.push)
+            return
+
+        # Hand the process over to git so it owns the terminal and the Python heap is released
+        sys.stdout.flush()
+        if args.push:
+            os.execvp("sh", ["sh", "-c", 'git commit -m "$1" && echo "📤 Pushing to remote..." && git push origin main', "sh", commit_message])
+        os.execvp("git", ["git", "commit", "-m", commit_message])
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
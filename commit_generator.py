@@ -1,9 +1,109 @@
 import subprocess
 import sys
 import os
+import re
+import json
+import fnmatch
+import asyncio
+import hashlib
+import sqlite3
+import functools
+import importlib.util
 from dataclasses import dataclass
-import openai
-from dotenv import load_dotenv
+
+# openai pulls in a large dependency tree, so it is only imported once a request is made
+_openai = None
+
+def _get_openai():
+    """Import openai on first use"""
+    global _openai
+    if _openai is None:
+        import openai
+        _openai = openai
+    return _openai
+
+@functools.lru_cache(maxsize=4)
+def _get_encoding(model: str):
+    """Load the tiktoken encoding for a model once per process, or None without tiktoken"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+def _http_client_options() -> dict:
+    """Options for the HTTP clients backing the OpenAI clients"""
+    # The SDK's default clients already pool keep-alive connections; HTTP/2 needs the optional h2 package
+    return {"http2": importlib.util.find_spec("h2") is not None}
+
+@functools.lru_cache(maxsize=4)
+def _get_client(api_key: str):
+    """Create the OpenAI client for an API key once per process"""
+    openai = _get_openai()
+    return openai.OpenAI(
+        api_key=api_key,
+        http_client=openai.DefaultHttpxClient(**_http_client_options())
+    )
+
+# Marker files checked in priority order when detecting the project type
+PROJECT_MARKERS = (
+    ("package.json", "javascript/node"),
+    ("requirements.txt", "python"),
+    ("pyproject.toml", "python"),
+    ("pom.xml", "java"),
+    ("Cargo.toml", "rust"),
+    ("go.mod", "go"),
+    ("composer.json", "php"),
+)
+
+@functools.lru_cache(maxsize=16)
+def _detect_project_type(repo_root: str) -> str:
+    """Detect project type from marker files in repo root"""
+    for marker, project_type in PROJECT_MARKERS:
+        if os.path.exists(os.path.join(repo_root, marker)):
+            return project_type
+    return "general"
+
+# Generated files whose hunks are summarized rather than sent to the model
+GENERATED_FILE_PATTERNS = ("*.lock", "package-lock.json", "*.min.*", "*.svg")
+
+# Single-file commits to these are messaged without calling the model
+DOC_EXTENSIONS = (".md", ".rst")
+
+# Whitespace and quotes stripped from both ends of a model response
+_MESSAGE_PADDING = " \t\r\n\"'"
+
+# Filled in with str.format_map by CommitGenerator._build_prompt
+_PROMPT_TEMPLATE = """
+You are an expert developer who writes perfect git commit messages following the Conventional Commits specification.
+{project_context}Analyze the following git diff and generate a single commit message that:
+            
+1. Uses the format: <type>(<scope>): <description>
+2. Types: feat, fix, docs, style, refactor, test, chore, perf, ci, build
+3. Scope is optional but helpful (e.g., auth, ui, api, deps)
+4. Keep description under 50 characters
+5. Be specific and descriptive
+6. Use imperative mood (e.g., "add" not "added")
+7. Don't include "fix typo" for obvious typos, be more specific
+
+Examples of good commit messages:
+- feat(auth): add OAuth login flow
+- fix(api): handle null user response
+- docs: update installation guide
+- refactor(utils): extract validation logic
+- test(auth): add login component tests
+
+Git diff:
+'''
+{diff_content}
+'''
+
+Respond with ONLY the commit message, nothing else. No explanations, no quotes, just the commit message.
+"""
 
 @dataclass
 class Config:
@@ -11,98 +111,246 @@ class Config:
     openai_api_key: str
     model: str="gpt-4"
     max_diff_length: int=8000
+    max_diff_tokens: int=2000
     temperature: float=0.3
+    max_concurrency: int=4
+    max_file_changes: int=300
+    use_cache: bool=True
 
-class CommitGenerator:
-    def __init__(self, config: Config):
-        self.config = config
-        openai.api_key = config.openai_api_key
+class GitSession:
+    """Runs git commands for one CLI invocation, memoizing read-only queries"""
+    def __init__(self):
+        self._results = {}
 
-    def get_staged_diff(self) -> str:
-        """Get the staged changes from git"""
+    def run(self, *args) -> subprocess.CompletedProcess:
+        """Run a git command and return the completed process with decoded output"""
         try:
             result = subprocess.run(
-                ["git", "diff", "--cached", "--no-color"],
+                ["git", *args],
                 capture_output=True,
-                text=True,
-                check=True
+                check=False
             )
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            print(f"Error getting diff: {e}", file=sys.stderr)
-            sys.exit(1)
         except FileNotFoundError:
             print("Git not found. Make sure git is installed in your PATH", file=sys.stderr)
             sys.exit(1)
 
+        # Git emits UTF-8 regardless of the locale, so decode once here instead of via text=True
+        return subprocess.CompletedProcess(
+            result.args,
+            result.returncode,
+            result.stdout.decode("utf-8", errors="replace"),
+            result.stderr.decode("utf-8", errors="replace")
+        )
+
+    def query(self, *args) -> subprocess.CompletedProcess:
+        """Run a read-only git command once, reusing its result for the rest of the session"""
+        if args not in self._results:
+            self._results[args] = self.run(*args)
+        return self._results[args]
+
+class CommitGenerator:
+    def __init__(self, config: Config = None):
+        self._config = config
+        self.git = GitSession()
+        self._context = None
+        self._cache_db = None
+
+    @property
+    def config(self) -> Config:
+        """Configuration, loaded on first use so git-only work needs no API key"""
+        if self._config is None:
+            self._config = load_config()
+        return self._config
+
+    @config.setter
+    def config(self, config: Config):
+        self._config = config
+
+    def get_staged_files(self) -> list:
+        """Get the paths of the staged files"""
+        return [path for _, _, path in self._staged_changes()[0]]
+
+    def get_staged_diff(self) -> str:
+        """Get the staged changes from git, summarizing generated and oversized files"""
+        rows, diff_content = self._staged_changes()
+        file_diffs = self._split_files(diff_content)
+        if len(file_diffs) != len(rows):
+            return diff_content
+
+        parts = []
+        for (added, deleted, path), file_diff in zip(rows, file_diffs):
+            # Binary files report "-" and only contribute a one-line patch
+            changes = 0 if added == "-" else int(added) + int(deleted)
+            if changes and (changes > self.config.max_file_changes or self._is_generated(path)):
+                header = file_diff.split("\n", 1)[0]
+                file_diff = f"{header}\n[{changes} lines changed in {path}]\n"
+            parts.append(file_diff)
+        return "".join(parts)
+
+    def get_trivial_message(self):
+        """Derive a message without the model when the only staged file is documentation"""
+        rows, diff_content = self._staged_changes()
+        if len(rows) != 1:
+            return None
+
+        path = rows[0][2]
+        if os.path.splitext(path)[1].lower() not in DOC_EXTENSIONS:
+            return None
+
+        action = "update"
+        if "\nnew file mode" in diff_content:
+            action = "add"
+        elif "\ndeleted file mode" in diff_content:
+            action = "remove"
+        return f"docs: {action} {os.path.basename(path)}"
+
+    def _is_generated(self, path: str) -> bool:
+        """Check whether a path looks like a lock file or build artifact"""
+        name = os.path.basename(path)
+        return any(fnmatch.fnmatch(name, pattern) for pattern in GENERATED_FILE_PATTERNS)
+
+    def _staged_changes(self) -> tuple:
+        """Get per-file numstat rows and the staged diff from a single git call"""
+        result = self.git.query("diff", "--cached", "--no-color", "--numstat", "--patch")
+        if result.returncode != 0:
+            print(f"Error getting diff: {result.stderr}", file=sys.stderr)
+            sys.exit(1)
+
+        # numstat lines come first, separated from the patch by a blank line
+        numstat, _, diff_content = result.stdout.partition("\n\n")
+        rows = []
+        for line in numstat.splitlines():
+            added, deleted, path = line.split("\t", 2)
+            rows.append((added, deleted, self._numstat_path(path)))
+        return rows, diff_content
+
+    def _numstat_path(self, path: str) -> str:
+        """Resolve a numstat rename such as 'src/{old => new}.py' to the new path"""
+        if " => " not in path:
+            return path
+        match = re.match(r"(.*)\{(.*) => (.*)\}(.*)", path)
+        if match:
+            prefix, _, new, suffix = match.groups()
+            return (prefix + new + suffix).replace("//", "/")
+        return path.split(" => ", 1)[1]
+
+    def _probe_repo(self) -> dict:
+        """Probe the work tree root and current branch with a single git call"""
+        result = self.git.query("rev-parse", "--show-toplevel", "--abbrev-ref", "HEAD")
+
+        # On an unborn branch rev-parse still prints the toplevel before failing on HEAD
+        lines = result.stdout.splitlines()
+        return {
+            "root": lines[0] if lines else None,
+            "branch": lines[1] if result.returncode == 0 and len(lines) > 1 else "unknown"
+        }
+
     def get_repo_context(self) -> dict:
         """Get additional repository context"""
-        context = {}
-        try:
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            context["branch"] = result.stdout.strip()
-        except:
-            context["branch"] = "unknown"
+        if self._context is not None:
+            return self._context
 
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--show-toplevel"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            repo_root = result.stdout.strip()
-            project_files = os.listdir(repo_root)
-            context["project_type"] = self._detect_project_type(project_files)
-        except:
+        repo_info = self._probe_repo()
+        context = {"branch": repo_info["branch"]}
+
+        if repo_info["root"]:
+            context["project_type"] = _detect_project_type(repo_info["root"])
+        else:
             context["project_type"] = "unknown"
 
+        self._context = context
         return context
 
-    def _detect_project_type(self, files: list) -> str:
-        """Detect project type from files in repo root"""
-        if "package.json" in files:
-            return "javascript/node"
-        elif "requirements.txt" in files or "pyproject.toml" in files:
-            return "python"
-        elif "pom.xml" in files:
-            return "java"
-        elif "Cargo.toml" in files:
-            return "rust"
-        elif "go.mod" in files:
-            return "go"
-        elif "composer.json" in files:
-            return "php"
+    def split_diff(self, diff_content: str) -> list:
+        """Split a diff at file boundaries into chunks that fit max_diff_tokens (max_diff_length without tiktoken)"""
+        # Measure chunks the same way _prepare_diff truncates them, so no chunk gets cut short
+        encoding = _get_encoding(self.config.model)
+        if encoding is not None:
+            limit = self.config.max_diff_tokens
+            size = lambda text: len(encoding.encode(text, disallowed_special=()))
         else:
-            return "general"
+            limit = self.config.max_diff_length
+            size = len
 
-    def generate_commit_message(self, diff_content: str, context: dict) -> str:
-        """Generate commit message using OpenAI API"""
-        if not diff_content.strip():
-            print("No staged changes found.", file=sys.stderr)
-            sys.exit(1)
+        chunks = []
+        current = ""
+        current_size = 0
+        for file_diff in self._split_files(diff_content):
+            file_size = size(file_diff)
+            if current and current_size + file_size > limit:
+                chunks.append(current)
+                current = ""
+                current_size = 0
+            current += file_diff
+            current_size += file_size
+        if current:
+            chunks.append(current)
+        return chunks
 
-        if len(diff_content) > self.config.max_diff_length:
-            diff_content = diff_content[:self.config.max_diff_length] + "\n... (diff truncated due to length)"
+    def _split_files(self, diff_content: str) -> list:
+        """Split a diff into one piece per file"""
+        return [file_diff for file_diff in re.split(r"(?m)^(?=diff --git )", diff_content) if file_diff]
+
+    def merge_commit_messages(self, diffs: list, messages: list) -> str:
+        """Merge per-chunk messages into one, led by the largest chunk's message"""
+        ranked = sorted(zip(diffs, messages), key=lambda pair: len(pair[0]), reverse=True)
+        subject = ranked[0][1]
+        body = []
+        for _, message in ranked[1:]:
+            if message != subject and message not in body:
+                body.append(message)
+
+        if not body:
+            return subject
+        return subject + "\n\n" + "\n".join(f"- {message}" for message in body)
+
+    def generate_commit_message(self, diff_content: str, context: dict, on_delta=None) -> str:
+        """Generate commit message using OpenAI API, passing text to on_delta as it streams in"""
+        diff_content = self._prepare_diff(diff_content)
+        cache_key = self._cache_key(diff_content, context)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            if on_delta:
+                on_delta(cached)
+            return cached
 
         prompt = self._build_prompt(diff_content, context)
+        openai = _get_openai()
+        client = self._client()
 
         try:
-            response = openai.chat.completions.create(
+            response = client.chat.completions.create(
                 model=self.config.model,
                 messages=[{"role" : "user", "content" : prompt}],
                 max_completion_tokens=100,
-                temperature=self.config.temperature
+                temperature=self.config.temperature,
+                stream=True
             )
 
-            commit_message = response.choices[0].message.content.strip()
-            commit_message = commit_message.strip('"\'')
+            parts = []
+            started = False
+            pending = ""
+            for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                if not on_delta:
+                    continue
 
+                # Show exactly what _clean_message keeps: drop leading padding and hold back
+                # trailing padding until more text follows it
+                text = pending + delta
+                if not started:
+                    text = text.lstrip(_MESSAGE_PADDING)
+                shown = text.rstrip(_MESSAGE_PADDING)
+                pending = text[len(shown):]
+                if shown:
+                    started = True
+                    on_delta(shown)
+
+            commit_message = self._clean_message("".join(parts))
+            self._cache_put(cache_key, commit_message)
             return commit_message
         except openai.APIError as e:
             print(f"OpenAI API error: {e}", file=sys.stderr)
@@ -111,42 +359,227 @@ class CommitGenerator:
             print(f"Unexpected error: {e}", file=sys.stderr)
             sys.exit(1)
 
+    async def generate_commit_message_async(self, diffs: list, context: dict) -> list:
+        """Generate one commit message per diff with concurrent OpenAI requests"""
+        openai = _get_openai()
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        client = openai.AsyncOpenAI(
+            api_key=self.config.openai_api_key,
+            http_client=openai.DefaultAsyncHttpxClient(**_http_client_options())
+        )
+
+        async def _one(diff: str) -> str:
+            diff = self._prepare_diff(diff)
+            cache_key = self._cache_key(diff, context)
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model=self.config.model,
+                    messages=[{"role" : "user", "content" : self._build_prompt(diff, context)}],
+                    max_completion_tokens=100,
+                    temperature=self.config.temperature
+                )
+            commit_message = self._parse_response(response)
+            self._cache_put(cache_key, commit_message)
+            return commit_message
+
+        try:
+            return await asyncio.gather(*[_one(diff) for diff in diffs])
+        except openai.APIError as e:
+            print(f"OpenAI API error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except Exception as e:
+            print(f"Unexpected error: {e}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            await client.close()
+
+    def generate_commit_messages(self, diffs: list, context: dict) -> list:
+        """Synchronous wrapper around generate_commit_message_async"""
+        return asyncio.run(self.generate_commit_message_async(diffs, context))
+
+    def submit_batch(self, diffs: list, contexts: list) -> str:
+        """Submit one request per diff to the OpenAI Batch API and return the batch id"""
+        lines = []
+        for index, (diff, context) in enumerate(zip(diffs, contexts)):
+            lines.append(json.dumps({
+                "custom_id": f"diff-{index}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.config.model,
+                    "messages": [{"role" : "user", "content" : self._build_prompt(self._prepare_diff(diff), context)}],
+                    "max_completion_tokens": 100,
+                    "temperature": self.config.temperature
+                }
+            }))
+
+        openai = _get_openai()
+        client = self._client()
+        try:
+            batch_file = client.files.create(
+                file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            return batch.id
+        except openai.APIError as e:
+            print(f"OpenAI API error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    def poll_batch(self, batch_id: str, count: int) -> list:
+        """Return the messages of a finished batch of count requests in submission order, or None while it runs"""
+        openai = _get_openai()
+        client = self._client()
+        try:
+            batch = client.batches.retrieve(batch_id)
+            if batch.status not in ("completed", "failed", "expired", "cancelled"):
+                return None
+            if batch.status != "completed":
+                print(f"Batch {batch_id} did not complete (status: {batch.status})", file=sys.stderr)
+                sys.exit(1)
+            # Successful requests land in the output file, failed ones in the error file
+            output = client.files.content(batch.output_file_id).text if batch.output_file_id else ""
+            errors = client.files.content(batch.error_file_id).text if batch.error_file_id else ""
+        except openai.APIError as e:
+            print(f"OpenAI API error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        messages = {}
+        failures = []
+        for line in (output + "\n" + errors).splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                failures.append(f"{record.get('custom_id')}: {record.get('error') or response.get('body')}")
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+            messages[record["custom_id"]] = self._clean_message(content)
+
+        if failures:
+            print(f"Batch {batch_id} had failed requests:", file=sys.stderr)
+            for failure in failures:
+                print(f"  {failure}", file=sys.stderr)
+            sys.exit(1)
+
+        missing = [f"diff-{index}" for index in range(count) if f"diff-{index}" not in messages]
+        if missing:
+            print(f"Batch {batch_id} returned no result for {', '.join(missing)}", file=sys.stderr)
+            sys.exit(1)
+
+        return [messages[f"diff-{index}"] for index in range(count)]
+
+    def cached_messages(self, diffs: list, context: dict):
+        """Return the cached message for every diff, or None if any is missing"""
+        messages = [self._cache_get(self._cache_key(self._prepare_diff(diff), context)) for diff in diffs]
+        return None if None in messages else messages
+
+    def cache_messages(self, diffs: list, context: dict, messages: list):
+        """Cache messages generated elsewhere, such as batch results, under their diffs"""
+        for diff, message in zip(diffs, messages):
+            self._cache_put(self._cache_key(self._prepare_diff(diff), context), message)
+
+    def _client(self):
+        """Get the OpenAI client shared by all requests"""
+        return _get_client(self.config.openai_api_key)
+
+    def _prepare_diff(self, diff_content: str) -> str:
+        """Validate the diff and truncate it to max_diff_tokens (max_diff_length without tiktoken)"""
+        if not diff_content.strip():
+            print("No staged changes found.", file=sys.stderr)
+            sys.exit(1)
+
+        encoding = _get_encoding(self.config.model)
+        if encoding is not None:
+            tokens = encoding.encode(diff_content, disallowed_special=())
+            if len(tokens) > self.config.max_diff_tokens:
+                diff_content = encoding.decode(tokens[:self.config.max_diff_tokens]) + "\n... (diff truncated due to length)"
+        elif len(diff_content) > self.config.max_diff_length:
+            diff_content = diff_content[:self.config.max_diff_length] + "\n... (diff truncated due to length)"
+
+        return diff_content
+
+    def _parse_response(self, response) -> str:
+        """Extract the commit message from a chat completion response"""
+        return self._clean_message(response.choices[0].message.content)
+
+    def _clean_message(self, content: str) -> str:
+        """Strip whitespace and surrounding quotes from a model response"""
+        return content.strip(_MESSAGE_PADDING)
+
+    def _cache_key(self, diff_content: str, context: dict) -> str:
+        """Key a generated message on the diff, model and project type"""
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (self.config.model, str(context.get("project_type")), diff_content):
+            digest.update(part.encode("utf-8", errors="replace"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _get_cache_db(self):
+        """Open the message cache lazily, returning None if it is disabled or unusable"""
+        if self._cache_db is None:
+            self._cache_db = False
+            if self.config.use_cache:
+                try:
+                    path = cache_path()
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    db = sqlite3.connect(path)
+                    db.execute("CREATE TABLE IF NOT EXISTS messages (key TEXT PRIMARY KEY, message TEXT NOT NULL)")
+                    self._cache_db = db
+                except (sqlite3.Error, OSError):
+                    pass
+        return self._cache_db or None
+
+    def _cache_get(self, key: str):
+        """Return the cached message for a key, if any"""
+        db = self._get_cache_db()
+        if db is None:
+            return None
+        try:
+            row = db.execute("SELECT message FROM messages WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _cache_put(self, key: str, message: str):
+        """Store a generated message in the cache"""
+        db = self._get_cache_db()
+        if db is None:
+            return
+        try:
+            with db:
+                db.execute("INSERT OR REPLACE INTO messages (key, message) VALUES (?, ?)", (key, message))
+        except sqlite3.Error:
+            pass
+
     def _build_prompt(self, diff_content: str, context: dict) -> str:
         """Build the prompt for the LLM"""
         project_context = ""
         if context.get("project_type") != "unknown":
-            project_context = f"This is a {context["project_type"]} project. "
-
-        return f"""
-You are an expert developer who writes perfect git commit messages following the Conventional Commits specification.
-{project_context}Analyze the following git diff and generate a single commit message that:
-            
-1. Uses the format: <type>(<scope>): <description>
-2. Types: feat, fix, docs, style, refactor, test, chore, perf, ci, build
-3. Scope is optional but helpful (e.g., auth, ui, api, deps)
-4. Keep description under 50 characters
-5. Be specific and descriptive
-6. Use imperative mood (e.g., "add" not "added")
-7. Don't include "fix typo" for obvious typos, be more specific
+            project_context = f"This is a {context['project_type']} project. "
 
-Examples of good commit messages:
-- feat(auth): add OAuth login flow
-- fix(api): handle null user response
-- docs: update installation guide
-- refactor(utils): extract validation logic
-- test(auth): add login component tests
+        return _PROMPT_TEMPLATE.format_map({"project_context": project_context, "diff_content": diff_content})
 
-Git diff:
-'''
-{diff_content}
-'''
-
-Respond with ONLY the commit message, nothing else. No explanations, no quotes, just the commit message.
-"""
+def cache_path() -> str:
+    """Location of the generated message cache"""
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "ai-commit", "cache.db")
 
+@functools.lru_cache(maxsize=1)
 def load_config() -> Config:
     """Load configuration from environment variables and config file"""
+    from dotenv import load_dotenv
     load_dotenv()
+
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("Error: OPENAI_API_KEY environment variable not set.", file=sys.stderr)
@@ -157,5 +590,8 @@ def load_config() -> Config:
         openai_api_key=api_key,
         model=os.getenv("AI_COMMIT_MODEL", "gpt-4"),
         max_diff_length=int(os.getenv("AI_COMMIT_MAX_DIFF_LENGTH", "8000")),
-        temperature=float(os.getenv("AI_COMMIT_TEMPERATURE", "0.3"))
+        max_diff_tokens=int(os.getenv("AI_COMMIT_MAX_DIFF_TOKENS", "2000")),
+        temperature=float(os.getenv("AI_COMMIT_TEMPERATURE", "0.3")),
+        max_concurrency=int(os.getenv("AI_COMMIT_MAX_CONCURRENCY", "4")),
+        max_file_changes=int(os.getenv("AI_COMMIT_MAX_FILE_CHANGES", "300"))
     )
\ No newline at end of file
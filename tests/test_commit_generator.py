@@ -0,0 +1,301 @@
+import json
+import subprocess
+from types import SimpleNamespace
+
+import pytest
+
+import ai_commit
+import commit_generator
+from commit_generator import CommitGenerator, Config
+
+
+class FakeGitSession:
+    """Stands in for GitSession, answering the staged-diff query with canned output"""
+    def __init__(self, stdout, returncode=0):
+        self.stdout = stdout
+        self.returncode = returncode
+
+    def query(self, *args):
+        return subprocess.CompletedProcess(["git", *args], self.returncode, self.stdout, "")
+
+
+def file_diff(path, body="@@ -1 +1 @@\n-old\n+new\n", header=""):
+    """Build the patch section git prints for one file"""
+    return f"diff --git a/{path} b/{path}\n{header}index 1111111..2222222 100644\n--- a/{path}\n+++ b/{path}\n{body}"
+
+
+def make_generator(numstat, patch, **config):
+    """Build a generator whose staged changes are the given numstat lines and patch"""
+    generator = CommitGenerator(Config(openai_api_key="test-key", **config))
+    stdout = "\n".join(numstat) + "\n\n" + patch if numstat else ""
+    generator.git = FakeGitSession(stdout)
+    return generator
+
+
+def batch_record(index, content=None, status_code=200, error=None):
+    """Build one line of a Batch API output or error file"""
+    body = {"choices": [{"message": {"content": content}}]} if status_code == 200 else {"error": "bad request"}
+    return json.dumps({"custom_id": f"diff-{index}", "response": {"status_code": status_code, "body": body}, "error": error})
+
+
+def fake_batch_client(output="", errors="", status="completed"):
+    """Stand in for the OpenAI client of a batch with the given status and result files"""
+    files = {"out": output, "err": errors}
+    batch = SimpleNamespace(status=status, output_file_id="out" if output else None, error_file_id="err" if errors else None)
+    return SimpleNamespace(
+        batches=SimpleNamespace(retrieve=lambda batch_id: batch),
+        files=SimpleNamespace(content=lambda file_id: SimpleNamespace(text=files[file_id])),
+    )
+
+
+class FakeEncoding:
+    """Stands in for a tiktoken encoding, counting one token per whitespace-separated word"""
+    def encode(self, text, disallowed_special=()):
+        return text.split()
+
+
+def fake_stream_client(deltas):
+    """Stand in for the OpenAI client, streaming a chat completion as the given deltas"""
+    def create(**kwargs):
+        assert deltas is not None, "cached message should not reach the API"
+        return iter(SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))]) for delta in deltas)
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture
+def without_tiktoken(monkeypatch):
+    monkeypatch.setattr(commit_generator, "_get_encoding", lambda model: None)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+@pytest.mark.parametrize("path,expected", [
+    ("src/app.py", "src/app.py"),
+    ("old.py => new.py", "new.py"),
+    ("src/{a.py => b.py}", "src/b.py"),
+    ("d/{ => sub}/f.py", "d/sub/f.py"),
+    ("d/{sub => }/f.py", "d/f.py"),
+])
+def test_numstat_path_resolves_renames(path, expected):
+    generator = make_generator([], "")
+    assert generator._numstat_path(path) == expected
+
+
+def test_staged_files_use_renamed_paths():
+    patch = file_diff("a.py") + "diff --git a/d/f.py b/d/sub/f.py\nsimilarity index 100%\nrename from d/f.py\nrename to d/sub/f.py\n"
+    generator = make_generator(["1\t1\ta.py", "0\t0\td/{ => sub}/f.py"], patch)
+    assert generator.get_staged_files() == ["a.py", "d/sub/f.py"]
+
+
+def test_no_staged_changes():
+    generator = make_generator([], "")
+    assert generator.get_staged_files() == []
+    assert generator.get_staged_diff() == ""
+
+
+def test_probe_repo_on_unborn_branch():
+    # rev-parse prints the toplevel, then fails on HEAD because there are no commits yet
+    generator = make_generator([], "")
+    generator.git = FakeGitSession("/work/repo\nHEAD\n", returncode=128)
+    assert generator._probe_repo() == {"root": "/work/repo", "branch": "unknown"}
+
+
+def test_probe_repo_outside_repository():
+    generator = make_generator([], "")
+    generator.git = FakeGitSession("", returncode=128)
+    assert generator._probe_repo()["root"] is None
+
+
+def test_probe_repo_on_branch():
+    generator = make_generator([], "")
+    generator.git = FakeGitSession("/work/repo\nmain\n")
+    assert generator._probe_repo() == {"root": "/work/repo", "branch": "main"}
+
+
+def test_trivial_message_needs_no_config(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    generator = CommitGenerator()
+    generator.git = FakeGitSession("1\t1\tREADME.md\n\n" + file_diff("README.md"))
+    assert generator.get_trivial_message() == "docs: update README.md"
+    assert generator._config is None
+
+
+def test_split_diff_keeps_files_whole(without_tiktoken):
+    files = [file_diff("a.py"), file_diff("b.py"), file_diff("c.py")]
+    generator = make_generator([], "", max_diff_length=len(files[0]) + len(files[1]))
+    chunks = generator.split_diff("".join(files))
+    assert chunks == [files[0] + files[1], files[2]]
+
+
+def test_split_diff_gives_oversized_file_its_own_chunk(without_tiktoken):
+    small = file_diff("a.py")
+    big = file_diff("big.py", "@@ -0,0 +1 @@\n+" + "x" * 200 + "\n")
+    generator = make_generator([], "", max_diff_length=100)
+    chunks = generator.split_diff(small + big + small)
+    assert chunks == [small, big, small]
+    assert "".join(chunks) == small + big + small
+
+
+def test_split_diff_counts_tokens_with_tiktoken(monkeypatch):
+    monkeypatch.setattr(commit_generator, "_get_encoding", lambda model: FakeEncoding())
+    files = [file_diff("a.py"), file_diff("b.py"), file_diff("c.py")]
+    tokens = len(files[0].split())
+    # The character limit would fit all three files, the token limit only two
+    generator = make_generator([], "", max_diff_tokens=2 * tokens, max_diff_length=10 * len(files[0]))
+    assert generator.split_diff("".join(files)) == [files[0] + files[1], files[2]]
+
+
+def test_split_diff_of_empty_diff():
+    generator = make_generator([], "")
+    assert generator.split_diff("") == []
+
+
+def test_merge_commit_messages_leads_with_largest_chunk():
+    generator = make_generator([], "")
+    merged = generator.merge_commit_messages(["a", "bbb", "cc", "dd"], ["fix: a", "feat: b", "fix: a", "docs: d"])
+    assert merged == "feat: b\n\n- fix: a\n- docs: d"
+
+
+def test_merge_commit_messages_collapses_duplicates():
+    generator = make_generator([], "")
+    assert generator.merge_commit_messages(["a", "b"], ["feat: x", "feat: x"]) == "feat: x"
+
+
+def test_binary_rows_are_kept_verbatim():
+    binary = "diff --git a/logo.png b/logo.png\nnew file mode 100644\nindex 0000000..3333333\nBinary files /dev/null and b/logo.png differ\n"
+    patch = file_diff("a.py") + binary
+    generator = make_generator(["1\t1\ta.py", "-\t-\tlogo.png"], patch, max_file_changes=0)
+    diff = generator.get_staged_diff()
+    assert generator.get_staged_files() == ["a.py", "logo.png"]
+    assert binary in diff
+    assert "[2 lines changed in a.py]" in diff
+
+
+def test_numstat_patch_mismatch_returns_raw_diff():
+    # Two numstat rows but only one patch section: sections cannot be paired, so nothing is summarized
+    patch = file_diff("yarn.lock")
+    generator = make_generator(["1\t1\tyarn.lock", "1\t1\tother.py"], patch)
+    assert generator.get_staged_diff() == patch
+
+
+def test_generated_files_are_summarized():
+    patch = file_diff("app.py") + file_diff("yarn.lock") + file_diff("dist/app.min.js")
+    generator = make_generator(["1\t1\tapp.py", "1\t1\tyarn.lock", "1\t1\tdist/app.min.js"], patch)
+    diff = generator.get_staged_diff()
+    assert file_diff("app.py") in diff
+    assert "diff --git a/yarn.lock b/yarn.lock\n[2 lines changed in yarn.lock]\n" in diff
+    assert "diff --git a/dist/app.min.js b/dist/app.min.js\n[2 lines changed in dist/app.min.js]\n" in diff
+    assert "+new" not in diff.split("yarn.lock", 1)[1]
+
+
+def test_oversized_files_are_summarized():
+    big_body = "@@ -0,0 +1,5 @@\n" + "".join(f"+line {n}\n" for n in range(5))
+    patch = file_diff("small.py") + file_diff("big.py", big_body)
+    generator = make_generator(["1\t1\tsmall.py", "5\t0\tbig.py"], patch, max_file_changes=4)
+    diff = generator.get_staged_diff()
+    assert file_diff("small.py") in diff
+    assert "[5 lines changed in big.py]" in diff
+    assert "+line 0" not in diff
+
+
+@pytest.mark.parametrize("header,expected", [
+    ("", "docs: update README.md"),
+    ("new file mode 100644\n", "docs: add guide.rst"),
+    ("deleted file mode 100644\n", "docs: remove README.md"),
+])
+def test_trivial_message_for_single_doc_file(header, expected):
+    path = expected.rsplit(" ", 1)[1]
+    generator = make_generator([f"1\t1\tdocs/{path}"], file_diff(f"docs/{path}", header=header))
+    assert generator.get_trivial_message() == expected
+
+
+@pytest.mark.parametrize("numstat", [
+    ["1\t1\tapp.py"],
+    ["1\t1\trequirements.txt"],
+    ["1\t1\tREADME.md", "1\t1\tapp.py"],
+])
+def test_no_trivial_message_otherwise(numstat):
+    patch = "".join(file_diff(line.split("\t")[2]) for line in numstat)
+    generator = make_generator(numstat, patch)
+    assert generator.get_trivial_message() is None
+
+
+def test_poll_batch_orders_results_by_request():
+    generator = make_generator([], "")
+    output = "\n".join([batch_record(1, "feat: b"), batch_record(0, "\"fix: a\"\n")])
+    generator._client = lambda: fake_batch_client(output)
+    assert generator.poll_batch("batch-1", 2) == ["fix: a", "feat: b"]
+
+
+@pytest.mark.parametrize("output,errors", [
+    (batch_record(1, "feat: b"), batch_record(0, error={"code": "server_error"})),
+    (batch_record(1, "feat: b") + "\n" + batch_record(0, status_code=400), ""),
+    (batch_record(1, "feat: b"), ""),
+])
+def test_poll_batch_rejects_incomplete_results(output, errors, capsys):
+    generator = make_generator([], "")
+    generator._client = lambda: fake_batch_client(output, errors)
+    with pytest.raises(SystemExit):
+        generator.poll_batch("batch-1", 2)
+    assert "diff-0" in capsys.readouterr().err
+
+
+def test_poll_batch_while_running():
+    generator = make_generator([], "")
+    generator._client = lambda: fake_batch_client(status="in_progress")
+    assert generator.poll_batch("batch-1", 1) is None
+
+
+def spooled_generator(tmp_path, spool_lines, staged_patch):
+    """Build a generator with the given staged patch and a batch spool of the given lines"""
+    generator = make_generator(["1\t1\ta.py"], staged_patch)
+    generator._context = {"branch": "main", "project_type": "python"}
+    spool = tmp_path / "batch.jsonl"
+    spool.write_text("".join(line + "\n" for line in spool_lines))
+    return generator, str(spool)
+
+
+def test_run_batch_refuses_stale_spool(tmp_path, capsys):
+    spool_lines = [json.dumps({"batch_id": "batch-1", "diff": file_diff("a.py")})]
+    generator, spool = spooled_generator(tmp_path, spool_lines, file_diff("a.py", "@@ -1 +1 @@\n-old\n+newer\n"))
+    with pytest.raises(SystemExit):
+        ai_commit.run_batch(generator, spool)
+    assert "Staged changes differ" in capsys.readouterr().err
+
+
+def test_run_batch_refuses_empty_spool(tmp_path, capsys):
+    generator, spool = spooled_generator(tmp_path, [], file_diff("a.py"))
+    with pytest.raises(SystemExit):
+        ai_commit.run_batch(generator, spool)
+    assert "is empty" in capsys.readouterr().err
+
+
+def test_run_batch_dry_run_keeps_spool_and_caches_result(tmp_path):
+    spool_lines = [json.dumps({"batch_id": "batch-1", "diff": file_diff("a.py")})]
+    generator, spool = spooled_generator(tmp_path, spool_lines, file_diff("a.py"))
+    generator._client = lambda: fake_batch_client(batch_record(0, "fix: a"))
+    assert ai_commit.run_batch(generator, spool, keep_spool=True) == "fix: a"
+    assert (tmp_path / "batch.jsonl").exists()
+    assert generator.cached_messages([file_diff("a.py")], generator._context) == ["fix: a"]
+
+
+@pytest.mark.parametrize("deltas,cached,expected", [
+    (["\n\"", "feat: x"], None, "feat: x"),
+    (["feat: x", "\"\n"], None, "feat: x"),
+    (["feat:", " ", "x"], None, "feat: x"),
+    (["\"", "\n", "fix: a", " ", "\n", "\"", ""], None, "fix: a"),
+    (None, "docs: cached", "docs: cached"),
+])
+def test_streamed_text_matches_returned_message(deltas, cached, expected):
+    generator = make_generator([], "")
+    context = {"branch": "main", "project_type": "python"}
+    if cached:
+        generator.cache_messages(["diff"], context, [cached])
+    generator._client = lambda: fake_stream_client(deltas)
+    shown = []
+    message = generator.generate_commit_message("diff", context, on_delta=shown.append)
+    assert message == expected
+    assert "".join(shown) == message